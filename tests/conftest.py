@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the Mergington High School API tests
+"""
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest_asyncio
+
+# Add src directory to path before importing the app
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from app import app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Create an async client shared by the whole test session
+
+    Redirects are not followed; tests that need them opt in per request.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport,
+                                 base_url="http://test",
+                                 follow_redirects=False) as test_client:
+        yield test_client
@@ -3,112 +3,127 @@ Tests for the Mergington High School API
 """
 
 import pytest
-from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
+import pytest_asyncio
+
+from app import activities
+
+
+# Activity metadata never changes between tests; only participants do
+_META = {
+    "Basketball": {
+        "description": "Team basketball practice and intramural games",
+        "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 15
+    },
+    "Tennis Club": {
+        "description": "Tennis lessons and match competitions",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 5:00 PM",
+        "max_participants": 10
+    },
+    "Drama Club": {
+        "description": "Theater performances and acting workshops",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 25
+    },
+    "Visual Arts": {
+        "description": "Painting, drawing, and sculpture techniques",
+        "schedule": "Saturdays, 10:00 AM - 12:00 PM",
+        "max_participants": 18
+    },
+    "Debate Team": {
+        "description": "Competitive debate and public speaking skills",
+        "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
+        "max_participants": 16
+    },
+    "Robotics Club": {
+        "description": "Build and program robots for competitions",
+        "schedule": "Thursdays and Saturdays, 3:30 PM - 5:30 PM",
+        "max_participants": 20
+    },
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30
+    }
+}
+
+_INITIAL_PARTICIPANTS = {
+    "Basketball": (),
+    "Tennis Club": (),
+    "Drama Club": (),
+    "Visual Arts": (),
+    "Debate Team": (),
+    "Robotics Club": (),
+    "Chess Club": ("michael@mergington.edu", "daniel@mergington.edu"),
+    "Programming Class": ("emma@mergington.edu", "sophia@mergington.edu"),
+    "Gym Class": ("john@mergington.edu", "olivia@mergington.edu")
+}
+
+
+def _initial_activities():
+    """Build a fresh copy of the initial activity state"""
+    return {
+        name: {**meta, "participants": list(_INITIAL_PARTICIPANTS[name])}
+        for name, meta in _META.items()
+    }
 
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from app import app, activities
+@pytest.fixture(scope="session")
+def initial_activities_loaded():
+    """Check once that the app starts from the expected initial state"""
+    assert activities == _initial_activities()
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+@pytest_asyncio.fixture(scope="session")
+async def initial_activities_payload(client, initial_activities_loaded):
+    """Fetch and parse GET /activities once for read-only assertions"""
+    response = await client.get("/activities")
+    assert response.status_code == 200
+    return response.json()
 
 
 @pytest.fixture
-def reset_activities():
+def reset_activities(initial_activities_loaded):
     """Reset activities to initial state after each test"""
-    initial_state = {
-        "Basketball": {
-            "description": "Team basketball practice and intramural games",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": []
-        },
-        "Tennis Club": {
-            "description": "Tennis lessons and match competitions",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 10,
-            "participants": []
-        },
-        "Drama Club": {
-            "description": "Theater performances and acting workshops",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": []
-        },
-        "Visual Arts": {
-            "description": "Painting, drawing, and sculpture techniques",
-            "schedule": "Saturdays, 10:00 AM - 12:00 PM",
-            "max_participants": 18,
-            "participants": []
-        },
-        "Debate Team": {
-            "description": "Competitive debate and public speaking skills",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 16,
-            "participants": []
-        },
-        "Robotics Club": {
-            "description": "Build and program robots for competitions",
-            "schedule": "Thursdays and Saturdays, 3:30 PM - 5:30 PM",
-            "max_participants": 20,
-            "participants": []
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        }
-    }
     yield
     # Reset activities after test
     activities.clear()
-    activities.update(initial_state)
+    activities.update(_initial_activities())
 
 
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
 
-    def test_get_activities(self, client, reset_activities):
+    def test_get_activities(self, initial_activities_payload):
         """Test retrieving all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
+        data = initial_activities_payload
         
-        # Check that all activities are present
-        assert "Basketball" in data
-        assert "Chess Club" in data
-        assert "Programming Class" in data
-        assert "Gym Class" in data
+        # Check that all activities are present (a missing key raises KeyError)
+        assert data["Chess Club"]
+        assert data["Programming Class"]
+        assert data["Gym Class"]
         
         # Verify activity structure
-        assert "description" in data["Basketball"]
-        assert "schedule" in data["Basketball"]
-        assert "max_participants" in data["Basketball"]
-        assert "participants" in data["Basketball"]
-
-    def test_activities_have_correct_participants(self, client, reset_activities):
+        basketball = data["Basketball"]
+        assert basketball["description"]
+        assert basketball["schedule"]
+        assert basketball["max_participants"]
+        assert basketball["participants"] == []
+
+    def test_activities_have_correct_participants(self,
+                                                  initial_activities_payload):
         """Test that activities have the correct initial participants"""
-        response = client.get("/activities")
-        data = response.json()
+        data = initial_activities_payload
         
         # Check pre-populated participants
         assert "michael@mergington.edu" in data["Chess Club"]["participants"]
@@ -120,53 +135,16 @@ class TestGetActivities:
 class TestSignup:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
 
-    def test_signup_for_activity(self, client, reset_activities):
-        """Test signing up for an activity"""
-        response = client.post(
-            "/activities/Basketball/signup?email=alice@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "alice@mergington.edu" in data["message"]
-        assert "Basketball" in data["message"]
-
-    def test_signup_increases_participant_count(self, client, reset_activities):
-        """Test that signup increases participant count"""
-        client.post("/activities/Basketball/signup?email=alice@mergington.edu")
-        
-        response = client.get("/activities")
-        data = response.json()
-        assert "alice@mergington.edu" in data["Basketball"]["participants"]
-        assert len(data["Basketball"]["participants"]) == 1
-
-    def test_signup_duplicate_student(self, client, reset_activities):
-        """Test that duplicate signups are rejected"""
-        client.post("/activities/Basketball/signup?email=alice@mergington.edu")
-        
-        # Try to sign up again
-        response = client.post(
-            "/activities/Basketball/signup?email=alice@mergington.edu"
-        )
-        assert response.status_code == 400
-        assert "already signed up" in response.json()["detail"]
-
-    def test_signup_for_nonexistent_activity(self, client, reset_activities):
-        """Test signup for activity that doesn't exist"""
-        response = client.post(
-            "/activities/NonExistent/signup?email=alice@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "Activity not found" in response.json()["detail"]
-
-    def test_signup_full_activity(self, client, reset_activities):
+    async def test_signup_full_activity(self, client, reset_activities):
         """Test signup for a full activity"""
         # Fill up the Chess Club (max 12 participants, currently has 2)
-        for i in range(10):
-            client.post(f"/activities/Chess Club/signup?email=student{i}@mergington.edu")
+        activities["Chess Club"]["participants"].extend(
+            f"student{i}@mergington.edu" for i in range(10)
+        )
         
         # Try to add one more (should fail)
-        response = client.post(
-            "/activities/Chess Club/signup?email=extra@mergington.edu"
+        response = await client.post(
+            "/activities/Chess Club/signup", params={"email": "extra@mergington.edu"}
         )
         assert response.status_code == 400
         assert "full" in response.json()["detail"]
@@ -175,60 +153,79 @@ class TestSignup:
 class TestUnregister:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
 
-    def test_unregister_from_activity(self, client, reset_activities):
-        """Test unregistering from an activity"""
-        # First sign up
-        client.post("/activities/Basketball/signup?email=alice@mergington.edu")
-        
-        # Then unregister
-        response = client.delete(
-            "/activities/Basketball/unregister?email=alice@mergington.edu"
+    async def test_unregister_existing_participant(self, client, reset_activities):
+        """Test unregistering an existing participant"""
+        response = await client.delete(
+            "/activities/Chess Club/unregister", params={"email": "michael@mergington.edu"}
         )
         assert response.status_code == 200
-        assert "alice@mergington.edu" in response.json()["message"]
-
-    def test_unregister_removes_participant(self, client, reset_activities):
-        """Test that unregister removes the participant"""
-        client.post("/activities/Basketball/signup?email=alice@mergington.edu")
-        client.delete("/activities/Basketball/unregister?email=alice@mergington.edu")
         
-        response = client.get("/activities")
+        # Verify they're removed
+        response = await client.get("/activities")
         data = response.json()
-        assert "alice@mergington.edu" not in data["Basketball"]["participants"]
+        assert "michael@mergington.edu" not in data["Chess Club"]["participants"]
 
-    def test_unregister_nonexistent_activity(self, client, reset_activities):
-        """Test unregister for activity that doesn't exist"""
-        response = client.delete(
-            "/activities/NonExistent/unregister?email=alice@mergington.edu"
-        )
-        assert response.status_code == 404
 
-    def test_unregister_student_not_signed_up(self, client, reset_activities):
-        """Test unregister for student not signed up"""
-        response = client.delete(
-            "/activities/Basketball/unregister?email=alice@mergington.edu"
-        )
-        assert response.status_code == 400
-        assert "not signed up" in response.json()["detail"]
+class TestSignupAndUnregister:
+    """Tests for signing up for and then unregistering from an activity"""
 
-    def test_unregister_existing_participant(self, client, reset_activities):
-        """Test unregistering an existing participant"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=michael@mergington.edu"
-        )
+    @pytest.mark.parametrize("activity_name,email", [
+        ("Basketball", "alice@mergington.edu"),
+        ("Tennis Club", "bob@mergington.edu"),
+    ])
+    async def test_signup_and_unregister_roundtrip(self, client, reset_activities,
+                                                   activity_name, email):
+        """Test that signup adds a participant and unregister removes them"""
+        url = f"/activities/{activity_name}"
+
+        # Sign up
+        response = await client.post(f"{url}/signup", params={"email": email})
         assert response.status_code == 200
-        
-        # Verify they're removed
-        response = client.get("/activities")
-        data = response.json()
-        assert "michael@mergington.edu" not in data["Chess Club"]["participants"]
+        message = response.json()["message"]
+        assert email in message
+        assert activity_name in message
+
+        response = await client.get("/activities")
+        participants = response.json()[activity_name]["participants"]
+        assert participants == [email]
+
+        # Unregister
+        response = await client.delete(f"{url}/unregister",
+                                       params={"email": email})
+        assert response.status_code == 200
+        assert email in response.json()["message"]
+
+        response = await client.get("/activities")
+        participants = response.json()[activity_name]["participants"]
+        assert participants == []
+
+
+class TestErrorCases:
+    """Tests for error responses from the signup and unregister endpoints"""
+
+    @pytest.mark.parametrize("method,path,email,expected_status,expected_substr", [
+        ("post", "/activities/Chess Club/signup", "michael@mergington.edu",
+         400, "already signed up"),
+        ("post", "/activities/NonExistent/signup", "alice@mergington.edu",
+         404, "Activity not found"),
+        ("delete", "/activities/NonExistent/unregister", "alice@mergington.edu",
+         404, "Activity not found"),
+        ("delete", "/activities/Basketball/unregister", "alice@mergington.edu",
+         400, "not signed up"),
+    ])
+    async def test_error_cases(self, client, reset_activities, method, path,
+                               email, expected_status, expected_substr):
+        """Test that invalid signup and unregister requests are rejected"""
+        response = await getattr(client, method)(path, params={"email": email})
+        assert response.status_code == expected_status
+        assert expected_substr in response.json()["detail"]
 
 
 class TestRoot:
     """Tests for GET / endpoint"""
 
-    def test_root_redirects(self, client):
+    async def test_root_redirects(self, client):
         """Test that root redirects to static index"""
-        response = client.get("/", follow_redirects=False)
+        response = await client.get("/")
         assert response.status_code == 307
         assert "/static/index.html" in response.headers["location"]